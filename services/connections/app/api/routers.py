@@ -1,10 +1,13 @@
 # fastAPI API Routers
-import asyncio
 import logging
+from datetime import datetime
 from typing import Dict, Optional
+from uuid import UUID
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import BaseModel
@@ -12,6 +15,7 @@ from starlette.status import (
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
+    HTTP_429_TOO_MANY_REQUESTS,
     HTTP_500_INTERNAL_SERVER_ERROR,
 )
 
@@ -23,6 +27,7 @@ from services.connections.app.db.schemas import (
     ConnectionUpdate,
     ErrorResponse,
 )
+from services.shared.utils.rate_limit import TokenBucket
 
 # Set up OAuth2 with password flow (token-based authentication)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -33,6 +38,31 @@ router = APIRouter(tags=["connections"])
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Per-sender friend request limit: burst size and tokens per second
+_FRIEND_REQUEST_BURST = 20
+_FRIEND_REQUEST_RATE = 5.0
+
+# Friend request rate limiters by sender; a sender idle long enough for
+# a full refill is dropped
+_friend_request_limiters: TTLCache = TTLCache(
+    maxsize=10_000, ttl=_FRIEND_REQUEST_BURST / _FRIEND_REQUEST_RATE
+)
+
+
+def check_friend_request_rate(sender_id: str) -> None:
+    """Reject a friend request with 429 if the sender is over the limit"""
+    limiter = _friend_request_limiters.get(sender_id) or TokenBucket(
+        _FRIEND_REQUEST_BURST, _FRIEND_REQUEST_RATE
+    )
+    # Re-store to restart the idle timer
+    _friend_request_limiters[sender_id] = limiter
+    if not limiter.try_consume():
+        logger.warning(f"Friend request rate limit hit for {sender_id}")
+        raise HTTPException(
+            status_code=HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many friend requests, try again later",
+        )
+
 
 class UserInfo(BaseModel):
     """Model for user information"""
@@ -114,16 +144,26 @@ async def health_check(
 
 @router.get("/connect/all", response_model=list[Connection])
 async def get_all_connections(
+    limit: int = Query(1000, ge=1, le=5000),
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[UUID] = None,
     connection_manager: ConnectionManager = Depends(get_connection_manager),
 ):
     """
     Get all connections in the database. Useful for admin purposes or debugging.
 
+    Parameters:
+    - **limit**: Maximum number of connections to return
+    - **after_created_at**: created_at of the last connection from the previous page
+    - **after_id**: id of the last connection from the previous page
+
     Returns:
-    - **list[Connection]**: All user connections
+    - **list[Connection]**: A page of user connections
     """
     logger.info("Fetching all user connections")
-    connection_data = await connection_manager.get_all_connections()
+    connection_data = await connection_manager.get_all_connections(
+        limit, after_created_at, after_id
+    )
 
     return connection_data
 
@@ -138,7 +178,10 @@ async def get_all_connections(
     },
 )
 async def get_user_connections(
-    user_id: str,
+    user_id: UUID,
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[datetime] = None,
+    before_id: Optional[UUID] = None,
     current_user: str = Depends(get_current_user),
     connection_manager: ConnectionManager = Depends(get_connection_manager),
 ):
@@ -147,6 +190,9 @@ async def get_user_connections(
 
     Parameters:
     - **user_id**: ID of the user whose connections are being requested
+    - **limit**: Maximum number of connections to return
+    - **before**: created_at of the last connection from the previous page
+    - **before_id**: id of the last connection from the previous page
 
     Returns:
     - **ConnectionResponse**: User's current connection information
@@ -158,7 +204,18 @@ async def get_user_connections(
         )
 
     logger.info(f"Fetching connections for user: {user_id}")
-    connection_data = await connection_manager.get_user_connections(user_id)
+
+    # Older pages aren't cached, so encode the rows directly with orjson
+    # instead of building and re-serializing Connection models
+    if before is not None:
+        rows = await connection_manager.get_user_connections_raw(
+            user_id, limit, before, before_id
+        )
+        return ORJSONResponse([dict(row) for row in rows])
+
+    connection_data = await connection_manager.get_user_connections(
+        user_id, limit, before
+    )
 
     return connection_data
 
@@ -171,6 +228,7 @@ async def get_user_connections(
         401: {"model": ErrorResponse, "description": "Unauthorized"},
         403: {"model": ErrorResponse, "description": "Forbidden"},
         404: {"model": ErrorResponse, "description": "User not found"},
+        429: {"model": ErrorResponse, "description": "Too many requests"},
     },
 )
 async def create_connection(
@@ -202,6 +260,8 @@ async def create_connection(
 
     # If this is a friend request (pending status), publish notification event
     if getattr(connection_data, "status", None) == "pending":
+        # Enforce the per-sender limit before anything is written
+        check_friend_request_rate(str(current_user))
         try:
             # Create connection
             connection = await connection_manager.create_connection(
@@ -215,25 +275,21 @@ async def create_connection(
                 sender_id = str(connection_data.user_id)
                 recipient_id = str(connection_data.friend_id)
 
-                # Publish notification with retry logic
-                notification_success = False
-                for attempt in range(3):  # Try 3 times
-                    notification_success = (
-                        await connection_manager.publish_notification_event(
-                            reference_id=connection.id,
-                            sender_id=sender_id,
-                            recipient_id=recipient_id,
-                            notification_type="friend_request",
-                            content_preview="You have a new friend request",
-                        )
+                # Buffer the notification; the RabbitMQ client publishes it
+                # and retries broker rejections in the background
+                notification_buffered = (
+                    await connection_manager.publish_notification_event(
+                        reference_id=connection.id,
+                        sender_id=sender_id,
+                        recipient_id=recipient_id,
+                        notification_type="friend_request",
+                        content_preview="You have a new friend request",
                     )
-                    if notification_success:
-                        break
-                    await asyncio.sleep(1)  # Wait before retrying
+                )
 
-                if not notification_success:
+                if not notification_buffered:
                     logger.warning(
-                        "Could not publish notification after multiple attempts, "
+                        "Could not queue friend request notification, "
                         "but connection was created"
                     )
 
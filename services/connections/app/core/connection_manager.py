@@ -2,14 +2,17 @@
 Notification manager for handling user Connection state.
 """
 
-import json
+import asyncio
 import logging
-from datetime import datetime
-from typing import Any, List, Optional
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, List, Optional
+from uuid import UUID
 
 import asyncpg  # type: ignore
-from pydantic.json import pydantic_encoder
-from services.shared.utils.retry import CircuitBreaker, with_retry
+import orjson
+from cachetools import TTLCache
+from services.shared.utils.retry import CircuitBreaker, with_retry_cfg
 
 # from ..db.models import Connection
 from ..db.schemas import (
@@ -23,6 +26,216 @@ from .connections_rabbitmq import ConnectionsRabbitMQClient
 # configure logging
 logger = logging.getLogger(__name__)
 
+# Health check timeout and how long a successful check is reused (seconds)
+_HEALTH_CHECK_TIMEOUT = 1.0
+_HEALTH_CHECK_CACHE_SECONDS = 5.0
+
+# Per-user connection list cache size and time-to-live (seconds)
+_CONN_CACHE_MAXSIZE = 10_000
+_CONN_CACHE_TTL = 30.0
+
+# Default page size of a user's connection list; the only bounded page
+# size that is cached
+_DEFAULT_PAGE_SIZE = 100
+
+# Result sets larger than this are parsed in a worker thread
+_THREAD_PARSE_THRESHOLD = 200
+
+# Pool sizing used unless overridden by config["postgres"]["pool"]
+_DEFAULT_POOL_CONFIG: dict[str, Any] = {
+    "min_size": 10,
+    "max_size": 50,
+    "max_inactive_connection_lifetime": 300.0,
+    # Default per-query timeout so one slow query can't hold a pool slot
+    "command_timeout": 5.0,
+}
+
+# Admin listing and bulk ingest of connections may legitimately run longer
+_BULK_QUERY_TIMEOUT = 30.0
+
+# Fixed fields of outgoing notification events, by notification type
+_NOTIFICATION_TEMPLATES: dict[str, dict[str, str]] = {
+    notification_type: {
+        "source": "connections",
+        "event_type": notification_type,
+        "notification_type": notification_type,
+    }
+    for notification_type in ("friend_request", "friend_accepted")
+}
+
+# One pool per process, shared by every ConnectionManager so extra
+# managers (lifespan restarts, tests) don't multiply min_size connections
+_POOL: Optional[asyncpg.Pool] = None
+_POOL_REFS = 0
+_POOL_LOCK = asyncio.Lock()
+
+# Queries are module-level constants so every call sends identical text
+# and hits asyncpg's per-connection prepared statement cache.
+
+# Exactly the fields of the Connection schema, in declaration order
+_CONNECTION_COLUMNS = "id, user_id, friend_id, status, created_at, updated_at"
+
+# Split the OR into two branches so each one is a range scan on its
+# keyset index (idx_conn_user_keyset / idx_conn_friend_keyset).
+# $2/$3 are an optional (created_at, id) keyset cursor; a missing id is
+# the nil UUID, which sorts first, so the page starts strictly before
+# $2. $4 is the page size (NULL = no limit).
+_USER_CONNECTIONS_SQL = f"""
+    (
+        SELECT {_CONNECTION_COLUMNS}
+        FROM connections.connections
+        WHERE user_id = $1
+        AND ($2::timestamp IS NULL OR (created_at, id) < ($2::timestamp,
+            COALESCE($3::uuid, '00000000-0000-0000-0000-000000000000')))
+        ORDER BY created_at DESC, id DESC
+        LIMIT $4
+    )
+    UNION ALL
+    (
+        SELECT {_CONNECTION_COLUMNS}
+        FROM connections.connections
+        WHERE friend_id = $1 AND user_id <> $1
+        AND ($2::timestamp IS NULL OR (created_at, id) < ($2::timestamp,
+            COALESCE($3::uuid, '00000000-0000-0000-0000-000000000000')))
+        ORDER BY created_at DESC, id DESC
+        LIMIT $4
+    )
+    ORDER BY created_at DESC, id DESC
+    LIMIT $4
+"""
+
+_ALL_CONNECTIONS_SQL = f"""
+    SELECT {_CONNECTION_COLUMNS}
+    FROM connections.connections
+"""
+
+# Keyset pagination over (created_at, id); $1/$2 are the last row seen
+_ALL_CONNECTIONS_PAGE_SQL = f"""
+    SELECT {_CONNECTION_COLUMNS}
+    FROM connections.connections
+    WHERE $1::timestamp IS NULL OR (created_at, id) > ($1::timestamp, $2::uuid)
+    ORDER BY created_at, id
+    LIMIT $3
+"""
+
+_CREATE_CONNECTION_SQL = f"""
+    INSERT INTO connections.connections (user_id, friend_id, status)
+    VALUES ($1, $2, $3)
+    ON CONFLICT (user_id, friend_id)
+    DO UPDATE SET status = $3, updated_at = NOW()
+    RETURNING {_CONNECTION_COLUMNS}
+"""
+
+# Bulk ingest: COPY into a transaction-scoped staging table, then upsert
+# in one statement (COPY itself cannot express ON CONFLICT). ord is the
+# input position, so a pair listed twice keeps its last status, as it
+# would with executemany
+_BULK_STAGING_SQL = """
+    CREATE TEMP TABLE connections_ingest (
+        ord integer, user_id uuid, friend_id uuid, status varchar(10)
+    ) ON COMMIT DROP
+"""
+
+_BULK_UPSERT_SQL = """
+    INSERT INTO connections.connections (user_id, friend_id, status)
+    SELECT DISTINCT ON (user_id, friend_id)
+        user_id, friend_id, status::connections.connection_status
+    FROM connections_ingest
+    ORDER BY user_id, friend_id, ord DESC
+    ON CONFLICT (user_id, friend_id)
+    DO UPDATE SET status = EXCLUDED.status, updated_at = NOW()
+"""
+
+# Batches larger than this use COPY instead of executemany
+_COPY_THRESHOLD = 100
+
+# Updates one direction and, when accepting, creates the reverse
+# direction in the same statement (one round trip, atomic)
+_UPDATE_CONNECTION_SQL = f"""
+    WITH updated AS (
+        UPDATE connections.connections
+        SET status = $1, updated_at = NOW()
+        WHERE (user_id = $2 AND friend_id = $3)
+        RETURNING {_CONNECTION_COLUMNS}
+    ), reverse AS (
+        INSERT INTO connections.connections (user_id, friend_id, status)
+        SELECT friend_id, user_id, status FROM updated
+        WHERE status = 'accepted'
+        ON CONFLICT (user_id, friend_id) DO NOTHING
+    )
+    SELECT {_CONNECTION_COLUMNS}
+    FROM updated
+"""
+
+# Matches either direction through the idx_conn_pair expression index
+_GET_CONNECTION_SQL = f"""
+    SELECT {_CONNECTION_COLUMNS}
+    FROM connections.connections
+    WHERE LEAST(user_id, friend_id) = LEAST($1::uuid, $2::uuid)
+    AND GREATEST(user_id, friend_id) = GREATEST($1::uuid, $2::uuid)
+"""
+
+
+_TS_SECOND = 0
+_TS_ISO = ""
+
+
+def _iso_now() -> str:
+    """Current UTC time as an ISO string, rebuilt once per second."""
+    global _TS_SECOND, _TS_ISO
+    second = int(time.time())
+    if second != _TS_SECOND:
+        _TS_ISO = datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+        _TS_SECOND = second
+    return _TS_ISO
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC for ``timestamp`` columns.
+
+    FastAPI parses cursors like ``...Z`` as aware datetimes, which
+    asyncpg refuses to encode as ``timestamp``.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _row_to_connection(row: asyncpg.Record) -> Connection:
+    """Build a Connection from a database row without re-validation.
+
+    Rows come straight from the connections table, so their types are
+    already correct and Pydantic validation would only add overhead.
+    """
+    return Connection.model_construct(
+        id=row["id"],
+        user_id=row["user_id"],
+        friend_id=row["friend_id"],
+        status=ConnectionStatus(row["status"]),
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+def _rows_to_connections(rows: list[asyncpg.Record]) -> list[Connection]:
+    """Build Connections from a batch of rows, one row at a time.
+
+    Uses the same unvalidated construction as single-row reads, so a
+    batch never fails as a whole.
+    """
+    return [_row_to_connection(row) for row in rows]
+
+
+async def _parse_rows(rows: list[asyncpg.Record]) -> list[Connection]:
+    """Convert rows to Connections, off the event loop for large batches.
+
+    Small batches are parsed inline since a thread hop costs more than
+    building the models.
+    """
+    if len(rows) > _THREAD_PARSE_THRESHOLD:
+        return await asyncio.to_thread(_rows_to_connections, rows)
+    return _rows_to_connections(rows)
+
 
 class ConnectionManager:
     """Manages user Connection state."""
@@ -41,6 +254,29 @@ class ConnectionManager:
         self.config = config
         self._initialized = False
         self.postgres_client: asyncpg.Pool
+        self._last_health_ok = float("-inf")
+        # Pool kwargs are fixed for the manager's lifetime, so strip
+        # unsupported keys once rather than on every reconnect attempt
+        postgres_config = config.get("postgres", {})
+        self._pg_kwargs = {
+            k: v
+            for k, v in postgres_config.items()
+            if k not in ("options", "pool")
+        }
+        self._pool_kwargs = {
+            **_DEFAULT_POOL_CONFIG,
+            **postgres_config.get("pool", {}),
+        }
+
+        # Newest-first connection pages keyed by user_id, then by page
+        # size (default or None), plus in-flight loads keyed by
+        # (user_id, page size) so concurrent misses share one query
+        self._conn_cache: TTLCache = TTLCache(
+            maxsize=_CONN_CACHE_MAXSIZE, ttl=_CONN_CACHE_TTL
+        )
+        self._conn_cache_loads: dict[
+            tuple[UUID, Optional[int]], asyncio.Task
+        ] = {}
 
         # Initialize RabbitMQ client
         self.rabbitmq = rabbitmq_client
@@ -56,15 +292,21 @@ class ConnectionManager:
             return
 
         try:
-            # Initialize database connection with circuit breaker
+            # Connect to the database and RabbitMQ concurrently; they are
+            # independent, so startup takes max() rather than sum()
+            startup = [asyncio.create_task(self._connect_rabbitmq())]
             if "postgres" in self.config:
-                await with_retry(
-                    self._connect_database,
-                    max_attempts=5,
-                    initial_delay=5.0,
-                    max_delay=60.0,
-                    circuit_breaker=self.db_cb,
-                )
+                startup.append(asyncio.create_task(self._connect_database()))
+            try:
+                await asyncio.gather(*startup)
+            except BaseException:
+                # Don't leave the other connect retrying in the background
+                for task in startup:
+                    task.cancel()
+                await asyncio.gather(*startup, return_exceptions=True)
+                raise
+
+            # Only consume once the pool exists, so handlers can use it
             await self.rabbitmq.register_consumers(
                 self._process_connection_message
             )
@@ -76,59 +318,201 @@ class ConnectionManager:
             self._initialized = False  # Reset initialization flag on failure
             raise
 
+    async def _connect_rabbitmq(self) -> None:
+        """Initialize the RabbitMQ client, raising if it fails."""
+        if not await self.rabbitmq.initialize():
+            raise RuntimeError("Failed to initialize RabbitMQ client")
+
     async def shutdown(self) -> None:
-        """Shutdown the Connection manager."""
+        """Shutdown the Connection manager.
+
+        The shared pool is only closed when the last manager using it
+        shuts down.
+        """
+        global _POOL, _POOL_REFS
 
         try:
             if self.postgres_client:
-                await self.postgres_client.close()
-                logger.info("Postgres connection closed")
+                async with _POOL_LOCK:
+                    _POOL_REFS -= 1
+                    if _POOL_REFS == 0 and _POOL is not None:
+                        pool, _POOL = _POOL, None
+                        await pool.close()
+                        logger.info("Postgres connection closed")
         except Exception as e:
             logger.error(f"Error closing Postgres connection: {e}")
         finally:
             self.postgres_client = None
             logger.info("Connection manager shut down")
 
+    @with_retry_cfg(
+        max_attempts=5,
+        initial_delay=1.0,
+        max_delay=30.0,
+        jitter=0.5,
+        cb_attr="db_cb",
+    )
     async def _connect_database(self) -> None:
-        """Connect to PostgreSQL."""
-        config = self.config["postgres"].copy()
+        """Connect to PostgreSQL, reusing the process-wide pool if open."""
+        global _POOL, _POOL_REFS
+
         try:
-            if "options" in config:
-                del config["options"]
-            self.postgres_client = await asyncpg.create_pool(
-                min_size=2, max_size=10, **config
-            )
-            logger.info("Connected to PostgreSQL database")
-            # Set search path for all connections in the pool
-            async with self.postgres_client.acquire() as conn:
-                await conn.execute("SET search_path TO connections, public")
-            logger.info("Postgres search_path set for pool")
+            async with _POOL_LOCK:
+                if _POOL is None:
+                    # create_pool opens min_size connections before
+                    # returning, so the pool is already warm when the
+                    # first request arrives
+                    _POOL = await asyncpg.create_pool(
+                        statement_cache_size=1024,
+                        # Sent as a startup parameter so it is the session
+                        # default on every pool connection and survives the
+                        # RESET ALL that asyncpg runs on release
+                        server_settings={
+                            "search_path": "connections, public"
+                        },
+                        **self._pool_kwargs,
+                        **self._pg_kwargs,
+                    )
+                    logger.info("Connected to PostgreSQL database")
+                _POOL_REFS += 1
+                self.postgres_client = _POOL
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
 
     async def check_connection_health(self):
+        """Check that Postgres answers within a short timeout.
+
+        A success is cached for a few seconds so frequent liveness probes
+        don't each take a pool connection.
+        """
+        now = time.monotonic()
+        if now - self._last_health_ok < _HEALTH_CHECK_CACHE_SECONDS:
+            return True
         try:
-            await self.postgres_client.execute("SELECT 1")
+            await asyncio.wait_for(
+                self.postgres_client.fetchval("SELECT 1"),
+                timeout=_HEALTH_CHECK_TIMEOUT,
+            )
+            self._last_health_ok = now
             return True
+        except asyncio.TimeoutError:
+            logger.error("Postgres health check timed out")
+            return False
         except Exception:
             logger.error("Postgres connection failed")
             return False
 
-    async def get_user_connections(self, user_id: str) -> List[Connection]:
-        """Get a user's connections."""
+    async def get_user_connections(
+        self,
+        user_id: UUID,
+        limit: Optional[int] = _DEFAULT_PAGE_SIZE,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None,
+    ) -> List[Connection]:
+        """Get a user's connections, newest first.
+
+        Args:
+            user_id: ID of the user
+            limit: Maximum number of connections to return (None for all)
+            before: created_at of the last connection already seen
+            before_id: id of the last connection already seen; without it
+                the page starts strictly before ``before``
+        """
         # Default values
         empty_connections: List[Connection] = []
 
-        # Fetch from database if not in cache
-        user_connections = await self._get_user_connections(user_id)
+        # Pages after a cursor are rare, so only the newest-first view is
+        # served from the cache
+        if before is not None:
+            user_connections = await self._get_user_connections(
+                user_id, limit, before, before_id
+            )
+            return user_connections or empty_connections
+
+        user_connections = await self._get_cached_user_connections(
+            user_id, limit
+        )
         if user_connections:
-            return user_connections
+            return list(user_connections)
 
         return empty_connections
 
+    async def _get_cached_user_connections(
+        self, user_id: UUID, limit: Optional[int]
+    ) -> list[Connection] | None:
+        """Get a user's newest ``limit`` connections, from cache if possible.
+
+        Only two page sizes are ever cached per user: the default first
+        page and the full list (``limit=None``). Smaller limits are sliced
+        from those; larger ones are served from a cached full list or
+        fetched without caching.
+        """
+        if limit is None:
+            page_size = None
+        elif limit <= _DEFAULT_PAGE_SIZE:
+            page_size = _DEFAULT_PAGE_SIZE
+        else:
+            page_size = limit
+
+        pages = self._conn_cache.get(user_id)
+        if pages is not None:
+            for cached_size in (page_size, None):
+                if cached_size in pages:
+                    return pages[cached_size][:limit]
+
+        if page_size not in (_DEFAULT_PAGE_SIZE, None):
+            return await self._get_user_connections(user_id, limit, None)
+
+        # Fetch from database if not in cache, sharing any in-flight load
+        key = (user_id, page_size)
+        load = self._conn_cache_loads.get(key)
+        if load is None:
+            load = asyncio.create_task(
+                self._load_user_connections(user_id, page_size)
+            )
+            self._conn_cache_loads[key] = load
+        connections = await asyncio.shield(load)
+        return connections[:limit] if connections is not None else None
+
+    async def _load_user_connections(
+        self, user_id: UUID, limit: Optional[int]
+    ) -> list[Connection] | None:
+        """Load a page of a user's connections and populate the cache."""
+        key = (user_id, limit)
+        load = asyncio.current_task()
+        try:
+            connections = await self._get_user_connections(
+                user_id, limit, None
+            )
+            # Skip the store if a write invalidated this load meanwhile
+            if (
+                connections is not None
+                and self._conn_cache_loads.get(key) is load
+            ):
+                pages = self._conn_cache.get(user_id)
+                if pages is None:
+                    pages = self._conn_cache[user_id] = {}
+                pages[limit] = connections
+            return connections
+        finally:
+            if self._conn_cache_loads.get(key) is load:
+                del self._conn_cache_loads[key]
+
+    def _invalidate_user_connections(self, *user_ids: UUID) -> None:
+        """Drop cached connection pages after a write."""
+        for user_id in user_ids:
+            self._conn_cache.pop(user_id, None)
+        stale = set(user_ids)
+        for key in [k for k in self._conn_cache_loads if k[0] in stale]:
+            del self._conn_cache_loads[key]
+
     async def _get_user_connections(
-        self, user_id: str
+        self,
+        user_id: UUID,
+        limit: Optional[int],
+        before: Optional[datetime],
+        before_id: Optional[UUID] = None,
     ) -> list[Connection] | None:
         """Get a user's connections from database."""
         if not self.postgres_client:
@@ -136,75 +520,110 @@ class ConnectionManager:
             return None
 
         try:
-            logger.info(f"Searching for connections of user_id: {user_id}")
-
-            async with self.postgres_client.acquire() as conn:
-                await conn.execute("SET search_path TO connections, public")
-
-                # Only get one direction of each relationship to avoid duplicates
-                query = """
-                    SELECT
-                        c.id,
-                        -- If the current user is user_id, then friend_id is their friend
-                        -- Otherwise, user_id is their friend
-                        CASE WHEN c.user_id = $1 THEN c.friend_id ELSE c.user_id END AS other_user_id,
-                        c.user_id,
-                        c.friend_id,
-                        c.status,
-                        c.created_at,
-                        c.updated_at
-                    FROM connections.connections c
-                    WHERE
-                        (c.user_id = $1 OR c.friend_id = $1)
-                """
-                rows = await conn.fetch(query, user_id)
+            rows = await self._fetch_user_connection_rows(
+                user_id, limit, before, before_id
+            )
 
-                # Convert rows to list of Connection
-                connections = []
-                for row in rows:
-                    try:
-                        # Convert row to dict and handle UUID types
-                        connection = Connection(
-                            id=row["id"],
-                            user_id=row["user_id"],
-                            friend_id=row["friend_id"],
-                            status=row["status"],
-                            created_at=row["created_at"],
-                            updated_at=row["updated_at"],
-                        )
-                        connections.append(connection)
-                    except Exception as e:
-                        logger.error(
-                            f"Error converting row to connection: {e}"
-                        )
+            # Convert rows to list of Connection
+            connections = await _parse_rows(rows)
 
-                logger.info(
-                    f"Found {len(connections)} connections for user {user_id}, {connections}"
-                )
+            logger.info(
+                "Found %d connections for user %s, %s",
+                len(connections),
+                user_id,
+                connections,
+            )
 
-                return connections
+            return connections
 
         except ValueError as e:
             logger.error(f"Invalid UUID format: {e}")
             return None
+        except asyncio.TimeoutError:
+            logger.error("Timed out getting user connections")
+            return None
         except Exception as e:
             logger.error(f"Failed to get user connections: {e}")
             return None
 
-    async def get_all_connections(self) -> List[Connection]:
-        """Get all connections."""
+    async def get_user_connections_raw(
+        self,
+        user_id: UUID,
+        limit: Optional[int] = _DEFAULT_PAGE_SIZE,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None,
+    ) -> list[asyncpg.Record]:
+        """Get a user's connections as raw records, newest first.
+
+        Skips building Connection objects for callers that only need to
+        serialize the rows (e.g. straight to JSON with orjson).
+        """
+        if not self.postgres_client:
+            logger.warning("Postgres not available")
+            return []
+
+        try:
+            return await self._fetch_user_connection_rows(
+                user_id, limit, before, before_id
+            )
+        except asyncio.TimeoutError:
+            logger.error("Timed out getting user connections")
+            return []
+        except Exception as e:
+            logger.error(f"Failed to get user connections: {e}")
+            return []
+
+    async def _fetch_user_connection_rows(
+        self,
+        user_id: UUID,
+        limit: Optional[int],
+        before: Optional[datetime],
+        before_id: Optional[UUID],
+    ) -> list[asyncpg.Record]:
+        """Fetch a user's connection rows from database."""
+        logger.info("Searching for connections of user_id: %s", user_id)
+
+        async with self.postgres_client.acquire() as conn:
+            return await conn.fetch(
+                _USER_CONNECTIONS_SQL,
+                user_id,
+                _naive_utc(before),
+                before_id,
+                limit,
+            )
+
+    async def get_all_connections(
+        self,
+        limit: int = 1000,
+        after_created_at: Optional[datetime] = None,
+        after_id: Optional[UUID] = None,
+    ) -> List[Connection]:
+        """Get a page of all connections, ordered by (created_at, id).
+
+        Args:
+            limit: Maximum number of connections to return
+            after_created_at: created_at of the last connection already seen
+            after_id: id of the last connection already seen
+        """
         # Default values
         empty_connections: List[Connection] = []
 
         # Fetch from database if not in cache
-        user_connections = await self._get_all_connections()
+        user_connections = await self._get_all_connections(
+            limit, after_created_at, after_id
+        )
         if user_connections:
             return user_connections
 
         return empty_connections
 
-    async def _get_all_connections(self) -> list[Connection] | None:
-        """Get all user connections from database."""
+    async def _get_all_connections(
+        self,
+        limit: int,
+        after_created_at: Optional[datetime],
+        after_id: Optional[UUID],
+    ) -> list[Connection] | None:
+        """Get a page of user connections from database."""
         if not self.postgres_client:
             logger.warning("Postgres not available")
             return None
@@ -212,44 +631,51 @@ class ConnectionManager:
         try:
             logger.debug("Searching for all connections")
             async with self.postgres_client.acquire() as conn:
-                # Execute the query directly on the connection
-
-                await conn.execute("SET search_path TO connections, public")
-
-                query = """
-                    SELECT * FROM connections.connections
-                """
-                # Execute the query
-                rows = await conn.fetch(query)
+                rows = await conn.fetch(
+                    _ALL_CONNECTIONS_PAGE_SQL,
+                    _naive_utc(after_created_at),
+                    after_id,
+                    limit,
+                    timeout=_BULK_QUERY_TIMEOUT,
+                )
 
                 # Convert rows to list of Connection
-                connections = []
-                for row in rows:
-                    try:
-                        # Convert row to dict and handle UUID types
-                        connection = Connection(
-                            id=row["id"],
-                            user_id=row["user_id"],
-                            friend_id=row["friend_id"],
-                            status=row["status"],
-                            created_at=row["created_at"],
-                            updated_at=row["updated_at"],
-                        )
-                        connections.append(connection)
-                    except Exception as e:
-                        logger.error(
-                            f"Error converting row to connection: {e}"
-                        )
+                connections = await _parse_rows(rows)
 
                 return connections
 
         except ValueError as e:
             logger.error(f"Invalid UUID format: {e}")
             return None
+        except asyncio.TimeoutError:
+            logger.error("Timed out getting user connections")
+            return None
         except Exception as e:
             logger.error(f"Failed to get user connections: {e}")
             return None
 
+    async def iter_all_connections(
+        self, prefetch: int = 1000
+    ) -> AsyncIterator[Connection]:
+        """Stream every connection without loading the table into memory.
+
+        Rows are read through a server-side cursor, so at most
+        ``prefetch`` records are held at a time.
+        """
+        if not self.postgres_client:
+            logger.warning("Postgres not available")
+            return
+
+        async with self.postgres_client.acquire() as conn:
+            # Server-side cursors only exist inside a transaction
+            async with conn.transaction(
+                readonly=True, isolation="repeatable_read"
+            ):
+                async for row in conn.cursor(
+                    _ALL_CONNECTIONS_SQL, prefetch=prefetch
+                ):
+                    yield _row_to_connection(row)
+
     async def create_connection(
         self, connection: ConnectionCreate
     ) -> Connection | None:
@@ -260,35 +686,24 @@ class ConnectionManager:
 
         try:
             logger.info(
-                f"Creating connection: {connection.user_id} -> {connection.friend_id}"
+                "Creating connection: %s -> %s",
+                connection.user_id,
+                connection.friend_id,
             )
             async with self.postgres_client.acquire() as conn:
-                await conn.execute("SET search_path TO connections, public")
-
-                query = """
-                    INSERT INTO connections.connections (user_id, friend_id, status)
-                    VALUES ($1, $2, $3)
-                    ON CONFLICT (user_id, friend_id)
-                    DO UPDATE SET status = $3, updated_at = NOW()
-                    RETURNING id, user_id, friend_id, status, created_at, updated_at
-                """
                 result = await conn.fetchrow(
-                    query,
+                    _CREATE_CONNECTION_SQL,
                     connection.user_id,
                     connection.friend_id,
                     connection.status,
                 )
 
                 if result:
-                    logger.info(f"Connection created with ID: {result['id']}")
-                    return Connection(
-                        id=result["id"],
-                        user_id=result["user_id"],
-                        friend_id=result["friend_id"],
-                        status=result["status"],
-                        created_at=result["created_at"],
-                        updated_at=result["updated_at"],
+                    logger.info("Connection created with ID: %s", result["id"])
+                    self._invalidate_user_connections(
+                        connection.user_id, connection.friend_id
                     )
+                    return _row_to_connection(result)
                 else:
                     logger.error("Failed to create connection")
                     return None
@@ -297,6 +712,56 @@ class ConnectionManager:
             logger.error(f"Failed to create connection: {e}")
             return None
 
+    async def create_connections(
+        self, connections: List[ConnectionCreate]
+    ) -> int | None:
+        """Create or update many connections in one transaction.
+
+        Returns:
+            The number of connections written, or None on failure
+        """
+        if not self.postgres_client:
+            logger.warning("Postgres not available")
+            return None
+        if not connections:
+            return 0
+
+        records = [(c.user_id, c.friend_id, c.status) for c in connections]
+        try:
+            logger.info("Creating %d connections", len(records))
+            async with self.postgres_client.acquire() as conn:
+                async with conn.transaction():
+                    if len(records) > _COPY_THRESHOLD:
+                        await conn.execute(_BULK_STAGING_SQL)
+                        await conn.copy_records_to_table(
+                            "connections_ingest",
+                            records=[
+                                (position, *record)
+                                for position, record in enumerate(records)
+                            ],
+                            columns=["ord", "user_id", "friend_id", "status"],
+                            timeout=_BULK_QUERY_TIMEOUT,
+                        )
+                        await conn.execute(
+                            _BULK_UPSERT_SQL, timeout=_BULK_QUERY_TIMEOUT
+                        )
+                    else:
+                        await conn.executemany(
+                            _CREATE_CONNECTION_SQL,
+                            records,
+                            timeout=_BULK_QUERY_TIMEOUT,
+                        )
+
+            self._invalidate_user_connections(
+                *{c.user_id for c in connections},
+                *{c.friend_id for c in connections},
+            )
+            return len(records)
+
+        except Exception as e:
+            logger.error(f"Failed to create connections: {e}")
+            return None
+
     async def update_connection(
         self, connection: ConnectionUpdate
     ) -> Connection | None:
@@ -308,16 +773,8 @@ class ConnectionManager:
         try:
             logger.debug(f"Updating connection for {connection.user_id}")
             async with self.postgres_client.acquire() as conn:
-                await conn.execute("SET search_path TO connections, public")
-
-                query = """
-                    UPDATE connections.connections
-                    SET status = $1, updated_at = NOW()
-                    WHERE (user_id = $2 AND friend_id = $3)
-                    RETURNING id, user_id, friend_id, status, created_at, updated_at
-                """
                 result = await conn.fetchrow(
-                    query,
+                    _UPDATE_CONNECTION_SQL,
                     connection.status,
                     connection.user_id,
                     connection.friend_id,
@@ -327,42 +784,18 @@ class ConnectionManager:
                     logger.error("Failed to update connection")
                     return None
 
-                # If status is ACCEPTED, create reverse direction if not exists
-                if connection.status == ConnectionStatus.ACCEPTED:
-                    reverse_query = """
-                        INSERT INTO connections.connections (user_id, friend_id, status)
-                        VALUES ($1, $2, $3)
-                        ON CONFLICT (user_id, friend_id) DO NOTHING
-                        RETURNING id, user_id, friend_id, status, created_at, updated_at
-                    """
-                    reverse_result = await conn.fetchrow(
-                        reverse_query,
-                        connection.friend_id,
-                        connection.user_id,
-                        ConnectionStatus.ACCEPTED,
-                    )
-                    if reverse_result:
-                        logger.info(
-                            f"Reverse connection created: {reverse_result['id']}"
-                        )
-                # If status is REJECTED, do nothing else (no reverse direction)
-
                 logger.info(f"Connection updated with ID: {result['id']}")
-                return Connection(
-                    id=result["id"],
-                    user_id=result["user_id"],
-                    friend_id=result["friend_id"],
-                    status=result["status"],
-                    created_at=result["created_at"],
-                    updated_at=result["updated_at"],
+                self._invalidate_user_connections(
+                    connection.user_id, connection.friend_id
                 )
+                return _row_to_connection(result)
 
         except Exception as e:
             logger.error(f"Failed to update connection: {e}")
             return None
 
     async def get_connection(
-        self, user_id: str, friend_id: str
+        self, user_id: UUID, friend_id: UUID
     ) -> Connection | None:
         """Get a specific connection between user and friend."""
         if not self.postgres_client:
@@ -371,24 +804,16 @@ class ConnectionManager:
 
         try:
             async with self.postgres_client.acquire() as conn:
-                await conn.execute("SET search_path TO connections, public")
-                query = """
-                    SELECT * FROM connections.connections
-                    WHERE (user_id = $1 AND friend_id = $2)
-                    OR (user_id = $2 AND friend_id = $1)
-                """
-                row = await conn.fetchrow(query, user_id, friend_id)
+                row = await conn.fetchrow(
+                    _GET_CONNECTION_SQL, user_id, friend_id
+                )
 
                 if row:
-                    return Connection(
-                        id=row["id"],
-                        user_id=row["user_id"],
-                        friend_id=row["friend_id"],
-                        status=row["status"],
-                        created_at=row["created_at"],
-                        updated_at=row["updated_at"],
-                    )
+                    return _row_to_connection(row)
                 return None
+        except asyncio.TimeoutError:
+            logger.error("Timed out getting connection")
+            return None
         except Exception as e:
             logger.error(f"Failed to get connection: {e}")
             return None
@@ -403,15 +828,16 @@ class ConnectionManager:
         correlation_id: Optional[str] = None,
         reply_to: Optional[str] = None,
     ) -> bool:
-        """Publish a notification event to RabbitMQ."""
+        """Buffer a notification event for publishing to RabbitMQ.
+
+        True means the event was queued, not that the broker confirmed it.
+        """
         try:
-            # Determine the correct routing key based on notification type
-            if notification_type == "friend_request":
-                event_type = "friend_request"
-            elif notification_type == "friend_accepted":
-                event_type = "friend_accepted"
-            else:
-                event_type = notification_type
+            template = _NOTIFICATION_TEMPLATES.get(notification_type) or {
+                "source": "connections",
+                "event_type": notification_type,
+                "notification_type": notification_type,
+            }
 
             if not correlation_id:
                 import uuid
@@ -420,33 +846,26 @@ class ConnectionManager:
 
             routing_key = f"user.{recipient_id}"
 
-            # Prepare message
-            message = json.dumps(
-                {
-                    "source": "connections",
-                    "event_type": event_type,
+            # Prepare message; orjson encodes UUIDs itself
+            message = orjson.dumps(
+                template
+                | {
                     "recipient_id": recipient_id,
                     "sender_id": sender_id,
-                    "reference_id": str(reference_id),
-                    "notification_type": notification_type,
+                    "reference_id": reference_id,
                     "content_preview": content_preview,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _iso_now(),
                 }
             )
 
-            # Publish friend request event using correct parameters
-            if notification_type == "friend_request":
-                await self.rabbitmq.publish_friend_request(  # Use specific method for requests
-                    message=message,
-                    routing_key=routing_key,
-                    reply_to=reply_to or "connection_notifications",
-                )
-            else:  # For friend_accepted and other types
-                await self.rabbitmq.publish_friend_accepted(
-                    exchange="",
-                    message=message,
-                    routing_key=reply_to or "connection_notifications",
-                )
+            published = await self.rabbitmq.publish_event(
+                notification_type,
+                message,
+                routing_key=routing_key,
+                reply_to=reply_to or "connection_notifications",
+            )
+            if not published:
+                return False
 
             logger.info(
                 f"Published {notification_type} notification for recipient {recipient_id}"
@@ -459,7 +878,7 @@ class ConnectionManager:
     async def _process_connection_message(self, message) -> None:
         """Process a connection update message from RabbitMQ."""
         try:
-            body = json.loads(message.body.decode())
+            body = orjson.loads(message.body)
 
             if "source" in body and body["source"] == "connections":
                 logger.warning("Invalid message source, ignoring")
@@ -555,8 +974,10 @@ class ConnectionManager:
                     await message.nack(requeue=False)
                     return
 
-                # Fetch user's connections
-                connections = await self.get_user_connections(user_id)
+                # Fetch all of the user's connections
+                connections = await self.get_user_connections(
+                    UUID(user_id), limit=None
+                )
                 if connections is None:
                     logger.error(
                         f"Failed to fetch connections for user {user_id}"
@@ -581,7 +1002,7 @@ class ConnectionManager:
                     }
                 
                 # Publish the connections back to the requester
-                response_message = json.dumps(
+                response_message = orjson.dumps(
                     {
                         "source": "connections",
                         "event_type": "friends_list",
@@ -1,16 +1,46 @@
 """
 RabbitMQ client for connection service.
 """
-import json
+import asyncio
+import itertools
 import logging
-from typing import Any, Callable, Dict, Optional
-from datetime import datetime
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple, Union
+
+import aio_pika
+import orjson
 
 from services.rabbitmq.core.client import RabbitMQClient as BaseRabbitMQClient
 from services.shared.utils.retry import CircuitBreaker, with_retry
 
 logger = logging.getLogger(__name__)
 
+# (exchange, default routing key) for each published event type
+_CONNECTIONS_EXCHANGE = "connections"
+_EVENT_ROUTES: Dict[str, Tuple[str, str]] = {
+    "friend_request": (_CONNECTIONS_EXCHANGE, "user.friend_request"),
+    "friend_accepted": (_CONNECTIONS_EXCHANGE, "user.friend_accepted"),
+}
+
+# A message is either pre-serialized or a JSON-able dict/list
+MessageBody = Union[str, bytes, Dict[str, Any], list]
+
+# Outgoing notifications are coalesced and published in batches of up
+# to this many messages, waiting at most this long for a batch to fill
+_DEFAULT_BATCH_MAX_SIZE = 100
+_DEFAULT_LINGER_MS = 5.0
+
+# A notification the broker keeps nacking is retried with exponential
+# backoff (base delay in seconds) and dropped after this many attempts
+_MAX_PUBLISH_ATTEMPTS = 5
+_RETRY_BASE_DELAY = 0.5
+
+# (exchange, routing_key, message, attempts so far)
+PendingMessage = Tuple[str, str, MessageBody, int]
+
+# Queued behind buffered notifications to stop the flusher at shutdown
+_FLUSH_STOP: Any = object()
+
 
 class ConnectionsRabbitMQClient:
     """RabbitMQ client for connection service."""
@@ -19,6 +49,18 @@ class ConnectionsRabbitMQClient:
         """Initialize the RabbitMQ client."""
         self.config = config or {}
         self.rabbitmq = BaseRabbitMQClient()
+        # Consumers get their own connection so heavy publishing can't
+        # be throttled by (or throttle) message delivery
+        self.consumer = BaseRabbitMQClient()
+
+        # Publisher channels, handed out one per publish
+        self._channel_pool_size = self.config.get(
+            "channel_pool_size",
+            self.rabbitmq.settings.RABBITMQ_MAX_CHANNEL_POOL_SIZE,
+        )
+        self._channel_pool: asyncio.Queue = asyncio.Queue(
+            maxsize=self._channel_pool_size
+        )
         
         # Initialize circuit breaker
         self.circuit_breaker = CircuitBreaker(
@@ -27,6 +69,22 @@ class ConnectionsRabbitMQClient:
             reset_timeout=30.0
         )
         self._initialized = False
+        # Concurrent first callers share one connect/retry sequence
+        self._init_lock = asyncio.Lock()
+
+        # Buffered notifications waiting to be published
+        self._publish_queue: asyncio.Queue[PendingMessage] = asyncio.Queue()
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._closing = False
+        # Backoff timers for nacked notifications: id -> (timer, message)
+        self._retries: Dict[
+            int, Tuple[asyncio.TimerHandle, PendingMessage]
+        ] = {}
+        self._retry_ids = itertools.count()
+        self._batch_max_size = self.config.get(
+            "batch_max_size", _DEFAULT_BATCH_MAX_SIZE
+        )
+        self._linger = self.config.get("linger_ms", _DEFAULT_LINGER_MS) / 1000
 
     async def initialize(self) -> bool:
         """Initialize the RabbitMQ client."""
@@ -34,32 +92,80 @@ class ConnectionsRabbitMQClient:
             logger.warning("RabbitMQ client already initialized")
             return True
 
-        try:
-            # Connect to RabbitMQ with retry
-            await with_retry(
-                self._connect,
-                max_attempts=5,
-                initial_delay=5.0,
-                max_delay=60.0,
-                circuit_breaker=self.circuit_breaker
-            )
-            
-            self._initialized = True
-            logger.info("Connection RabbitMQ client initialized successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to initialize RabbitMQ client: {e}")
-            self._initialized = False
+        # Fail fast while the breaker is open instead of entering the
+        # retry loop; is_open() moves it to half-open after the timeout
+        if (
+            self.circuit_breaker.state == "OPEN"
+            and self.circuit_breaker.is_open()
+        ):
+            logger.debug("RabbitMQ circuit breaker open, failing fast")
             return False
 
+        async with self._init_lock:
+            # Another caller may have connected while we waited
+            if self._initialized:
+                return True
+
+            try:
+                # Connect to RabbitMQ with retry
+                await with_retry(
+                    self._connect,
+                    max_attempts=5,
+                    initial_delay=5.0,
+                    max_delay=60.0,
+                    # Spread replicas' reconnects over the whole window
+                    full_jitter=True,
+                    circuit_breaker=self.circuit_breaker
+                )
+
+                self._initialized = True
+                if self._flusher_task is None:
+                    self._flusher_task = asyncio.create_task(self._flusher())
+                logger.info(
+                    "Connection RabbitMQ client initialized successfully"
+                )
+                return True
+            except Exception as e:
+                logger.error(f"Failed to initialize RabbitMQ client: {e}")
+                self._initialized = False
+                return False
+
     async def shutdown(self) -> None:
         """Shutdown the RabbitMQ client."""
         try:
+            self._closing = True
+            if self._flusher_task is not None:
+                # Let the flusher finish its in-flight batch instead of
+                # cancelling it mid-publish
+                self._publish_queue.put_nowait(_FLUSH_STOP)
+                try:
+                    await self._flusher_task
+                except Exception as e:
+                    logger.error(f"Notification flusher failed: {e}")
+                self._flusher_task = None
+            # Retries still backing off are published now rather than lost
+            if self._retries:
+                logger.info(
+                    f"Flushing {len(self._retries)} notifications "
+                    "awaiting retry"
+                )
+                for handle, item in self._retries.values():
+                    handle.cancel()
+                    self._publish_queue.put_nowait(item)
+                self._retries.clear()
+            # Publish anything still buffered before closing
+            while not self._publish_queue.empty():
+                await self._publish_batch(self._drain_batch())
+            await self.consumer.close()
             await self.rabbitmq.close()
+            self._channel_pool = asyncio.Queue(
+                maxsize=self._channel_pool_size
+            )
             logger.info("RabbitMQ connection closed")
         except Exception as e:
             logger.error(f"Error closing RabbitMQ connection: {e}")
         finally:
+            self._closing = False
             self._initialized = False
 
     async def _connect(self) -> None:
@@ -70,21 +176,16 @@ class ConnectionsRabbitMQClient:
             if not connected:
                 raise Exception("Failed to connect to RabbitMQ")
 
-            # Declare exchanges
+            # Declared one after another: they all share one channel, on
+            # which the broker answers synchronous RPCs strictly in order
             await self.rabbitmq.declare_exchange("connections", "topic")
             await self.rabbitmq.declare_exchange("notifications", "topic")
 
             # Declare queue for connection events
-            await self.rabbitmq.declare_queue(
-                "connections",
-                durable=True
-            )
-            
+            await self.rabbitmq.declare_queue("connections", durable=True)
+
             # Declare queue for connection notifications
-            await self.rabbitmq.declare_queue(
-                "notifications",
-                durable=True
-            )
+            await self.rabbitmq.declare_queue("notifications", durable=True)
 
             # Bind queues to exchanges with appropriate routing keys
             await self.rabbitmq.bind_queue(
@@ -92,18 +193,186 @@ class ConnectionsRabbitMQClient:
                 "connections",
                 "user.#"  # All connection update events
             )
-            
             await self.rabbitmq.bind_queue(
                 "notifications",
                 "notifications",
                 "user.#"  # All connection notifications
             )
+
+            # Open the publisher channel pool
+            while not self._channel_pool.full():
+                self._channel_pool.put_nowait(await self._open_channel())
+
+            # Separate connection for consumers, once the queues exist
+            if not await self.consumer.connect():
+                raise Exception("Failed to connect RabbitMQ consumer")
             
             logger.info("Connected to RabbitMQ for connection events")
         except Exception as e:
             logger.error(f"Failed to connect to RabbitMQ: {e}")
+            # Release the half-open connection and its pooled channels so
+            # the next attempt starts clean instead of leaking them
+            try:
+                await self.rabbitmq.close()
+            except Exception as close_error:
+                logger.debug(
+                    f"Error closing RabbitMQ connection: {close_error}"
+                )
+            self._channel_pool = asyncio.Queue(
+                maxsize=self._channel_pool_size
+            )
             raise
 
+    async def _open_channel(self) -> aio_pika.abc.AbstractChannel:
+        """Open a publisher channel in confirm mode."""
+        return await self.rabbitmq.connection.channel(publisher_confirms=True)
+
+    @asynccontextmanager
+    async def _acquire_channel(
+        self,
+    ) -> AsyncIterator[aio_pika.abc.AbstractChannel]:
+        """Borrow a publisher channel from the pool.
+
+        A channel that was closed while borrowed is replaced with a fresh
+        one so the pool never hands out a closed channel.
+        """
+        channel = await self._channel_pool.get()
+        try:
+            yield channel
+        finally:
+            if channel.is_closed:
+                try:
+                    channel = await self._open_channel()
+                except Exception as e:
+                    logger.error(f"Failed to reopen RabbitMQ channel: {e}")
+            self._channel_pool.put_nowait(channel)
+
+    async def _publish(
+        self,
+        exchange: str,
+        routing_key: str,
+        message: MessageBody,
+        correlation_id: Optional[str] = None,
+    ) -> None:
+        """Publish a message on a pooled channel."""
+        async with self._acquire_channel() as channel:
+            await self._publish_on(
+                channel, exchange, routing_key, message, correlation_id
+            )
+
+    async def _publish_on(
+        self,
+        channel: aio_pika.abc.AbstractChannel,
+        exchange: str,
+        routing_key: str,
+        message: MessageBody,
+        correlation_id: Optional[str] = None,
+    ) -> None:
+        """Publish a message and wait for the broker to confirm it."""
+        if isinstance(message, (dict, list)):
+            message = orjson.dumps(message)
+        elif isinstance(message, str):
+            message = message.encode("utf-8")
+        message_body = aio_pika.Message(
+            body=message,
+            content_type="application/json",
+            correlation_id=correlation_id,
+        )
+        if exchange:
+            exchange_obj = await channel.get_exchange(exchange, ensure=False)
+        else:
+            exchange_obj = channel.default_exchange
+        await exchange_obj.publish(message_body, routing_key=routing_key)
+
+    async def _flusher(self) -> None:
+        """Publish buffered notifications in batches.
+
+        Waits for one message, lingers briefly so a burst can accumulate,
+        then publishes everything buffered (up to the batch size) at once.
+        Returns once shutdown has begun and its batch is published.
+        """
+        while True:
+            first = await self._publish_queue.get()
+            if first is _FLUSH_STOP:
+                return
+            await asyncio.sleep(self._linger)
+            await self._publish_batch(self._drain_batch([first]))
+            if self._closing:
+                return
+
+    def _drain_batch(
+        self, batch: Optional[list] = None
+    ) -> list[PendingMessage]:
+        """Take up to batch_max_size buffered messages without waiting.
+
+        Stops early at the shutdown sentinel, which is discarded.
+        """
+        batch = batch or []
+        while (
+            len(batch) < self._batch_max_size
+            and not self._publish_queue.empty()
+        ):
+            item = self._publish_queue.get_nowait()
+            if item is _FLUSH_STOP:
+                break
+            batch.append(item)
+        return batch
+
+    async def _publish_batch(self, batch: list[PendingMessage]) -> None:
+        """Publish a batch on one channel and await its confirms together.
+
+        Every message is sent before any confirm is awaited, so the batch
+        costs about one broker round trip. Messages the broker nacks are
+        buffered again after an exponential backoff (immediately during
+        shutdown), and dropped once they reach _MAX_PUBLISH_ATTEMPTS;
+        other failures are logged and dropped.
+        """
+        async with self._acquire_channel() as channel:
+            results = await asyncio.gather(
+                *(
+                    self._publish_on(channel, exchange, routing_key, message)
+                    for exchange, routing_key, message, _ in batch
+                ),
+                return_exceptions=True,
+            )
+        for item, result in zip(batch, results):
+            if isinstance(result, aio_pika.exceptions.DeliveryError):
+                exchange, routing_key, message, attempts = item
+                attempts += 1
+                if attempts >= _MAX_PUBLISH_ATTEMPTS:
+                    logger.error(
+                        f"Broker rejected notification to {routing_key} "
+                        f"{attempts} times, dropping it"
+                    )
+                    continue
+                retry = (exchange, routing_key, message, attempts)
+                if self._closing:
+                    self._publish_queue.put_nowait(retry)
+                    continue
+                delay = _RETRY_BASE_DELAY * 2 ** (attempts - 1)
+                logger.warning(
+                    f"Broker rejected notification to {routing_key}, "
+                    f"retrying in {delay:.1f}s"
+                )
+                self._schedule_retry(retry, delay)
+            elif isinstance(result, Exception):
+                logger.error(
+                    f"Failed to publish notification to {item[1]}: {result}"
+                )
+
+    def _schedule_retry(self, item: PendingMessage, delay: float) -> None:
+        """Buffer ``item`` again after ``delay`` seconds."""
+        retry_id = next(self._retry_ids)
+        handle = asyncio.get_running_loop().call_later(
+            delay, self._requeue, retry_id
+        )
+        self._retries[retry_id] = (handle, item)
+
+    def _requeue(self, retry_id: int) -> None:
+        """Timer callback: move a backed-off message back to the queue."""
+        _, item = self._retries.pop(retry_id)
+        self._publish_queue.put_nowait(item)
+
     async def register_consumers(
         self, 
         connection_update_handler: Callable
@@ -114,7 +383,7 @@ class ConnectionsRabbitMQClient:
                 await self.initialize()
                 
             # Start consuming messages with provided handlers
-            await self.rabbitmq.consume(
+            await self.consumer.consume(
                 "connections",
                 connection_update_handler
             )
@@ -124,61 +393,37 @@ class ConnectionsRabbitMQClient:
             logger.error(f"Failed to register consumer handlers: {e}")
             raise
 
-    async def publish_friend_request(
+    async def publish_event(
         self,
-        message: str,
-        routing_key: str,
-        reply_to: Optional[str],
+        event_type: str,
+        message: MessageBody,
+        routing_key: Optional[str] = None,
+        reply_to: Optional[str] = None,
     ) -> bool:
-        """Publish a friend request notification event."""
+        """Publish a connection event.
+
+        With ``reply_to`` the message goes straight to that queue through
+        the default exchange; otherwise it is routed by the event type's
+        entry in the dispatch table (``routing_key`` overrides its key).
+
+        Returns True once the message is buffered for the background
+        flusher, not once the broker has confirmed it; rejected messages
+        are retried by the flusher.
+        """
         try:
-            if not self._initialized:
-                await self.initialize()
-            
-            if routing_key is None:
-                routing_key = "user.friend_request"
-            # if reply_to is None:
-            #     reply_to = "connection_notifications"
-            
+            if not self._initialized and not await self.initialize():
+                return False
+
             if reply_to is not None:
-                await self.rabbitmq.publish_message(
-                    exchange="",
-                    routing_key=reply_to,
-                    message=message,
-                )
+                exchange, routing_key = "", reply_to
             else:
-                await self.rabbitmq.publish_message(
-                    exchange="connections",
-                    routing_key=routing_key,
-                    message=message
-                )
-            
-            return True
-        except Exception as e:
-            logger.error(f"Failed to publish friend request notification: {e}")
-            return False
-            
-    async def publish_friend_accepted(
-        self,
-        exchange: str,
-        message: str,
-        routing_key: str,
-    ) -> bool:
-        """Publish a friend acceptance notification event."""
-        try:
-            if not self._initialized:
-                await self.initialize()
+                exchange, default_key = _EVENT_ROUTES[event_type]
+                routing_key = routing_key or default_key
 
-            await self.rabbitmq.publish_message(
-                exchange=exchange,
-                routing_key=routing_key,
-                message=message
-            )
-            
-            logger.info(f"Published friend acceptance notification")
+            await self._publish_queue.put((exchange, routing_key, message, 0))
             return True
         except Exception as e:
-            logger.error(f"Failed to publish friend acceptance notification: {e}")
+            logger.error(f"Failed to publish {event_type} event: {e}")
             return False
 
     async def is_connected(self) -> bool:
@@ -187,7 +432,7 @@ class ConnectionsRabbitMQClient:
 
     async def publish_friends_list(
         self,
-        message: str,
+        message: MessageBody,
         routing_key: str,
         correlation_id: str
     ) -> bool:
@@ -196,14 +441,14 @@ class ConnectionsRabbitMQClient:
         logger.info(f"Message content: {message}")
         logger.info(f"Reply to: {routing_key}, Correlation ID: {correlation_id}")
         try:
-            if not self._initialized:
-                await self.initialize()
+            if not self._initialized and not await self.initialize():
+                return False
             
-            await self.rabbitmq.publish_message(
-                exchange="",
-                routing_key=routing_key,
-                message=message,
-                correlation_id=correlation_id
+            await self._publish(
+                "",
+                routing_key,
+                message,
+                correlation_id=correlation_id,
             )
 
             return True
@@ -4,32 +4,46 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
-    String,
     UniqueConstraint,
     func,
     text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ENUM, UUID
 
+from services.connections.app.db.schemas import ConnectionStatus
 from services.shared.base import Base
 
+# Native enum: 4 bytes per row and no per-row CHECK on writes
+connection_status_enum = ENUM(
+    *(status.value for status in ConnectionStatus),
+    name="connection_status",
+    schema="connections",
+)
+
 
 class Connection(Base):
     __tablename__ = "connections"
     __table_args__ = (
-        CheckConstraint(
-            "status IN ('pending', 'accepted', 'rejected', 'blocked')",
-            name="ck_connection_status_enum",
-        ),
         CheckConstraint(
             "user_id != friend_id",
             name="ck_user_friend_different",
         ),
+        # Also serves as the (user_id, friend_id) lookup index
         UniqueConstraint("user_id", "friend_id", name="unique_connection"),
-        Index("idx_connection_user", "user_id"),
-        Index("idx_connection_friend", "friend_id"),
+        # (created_at, id) keyset-ordered per-user lookup; the leading
+        # column also serves plain user_id / friend_id lookups. No index
+        # covers status or updated_at, so status changes stay HOT updates
         Index(
-            "idx_connection_user_friend", "user_id", "friend_id", unique=True
+            "idx_conn_user_keyset",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "idx_conn_friend_keyset",
+            "friend_id",
+            text("created_at DESC"),
+            text("id DESC"),
         ),
         {
             "comment": (
@@ -51,7 +65,7 @@ class Connection(Base):
     friend_id = Column(
         UUID(as_uuid=True), ForeignKey("users.users.id", ondelete="CASCADE")
     )
-    status = Column(String(10), nullable=False)
+    status = Column(connection_status_enum, nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(
         DateTime,
@@ -67,3 +81,12 @@ class Connection(Base):
     # friend = relationship(
     #     "User", foreign_keys=[friend_id], back_populates="friends"
     # )
+
+
+# Direction-agnostic lookup of the pair (a, b) with a single index probe.
+# Not unique: accepted connections are stored in both directions.
+Index(
+    "idx_conn_pair",
+    func.least(Connection.user_id, Connection.friend_id),
+    func.greatest(Connection.user_id, Connection.friend_id),
+)
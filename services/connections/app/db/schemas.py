@@ -1,9 +1,27 @@
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+_LAST_NOW_NS = 0
+_LAST_NOW: Optional[datetime] = None
+
+
+def _now_utc() -> datetime:
+    """Current UTC time, reused for up to a millisecond.
+
+    Default timestamps for models built in the same burst share one
+    datetime instead of each making a clock call.
+    """
+    global _LAST_NOW_NS, _LAST_NOW
+    ns = time.monotonic_ns()
+    if _LAST_NOW is None or ns - _LAST_NOW_NS > 1_000_000:
+        _LAST_NOW = datetime.now(timezone.utc)
+        _LAST_NOW_NS = ns
+    return _LAST_NOW
 
 
 class ConnectionStatus(str, Enum):
@@ -29,10 +47,10 @@ class Connection(BaseModel):
         default=ConnectionStatus.PENDING,
         description="Status of the connection",
     )
-    created_at: Optional[datetime] = Field(default_factory=datetime.now)
-    updated_at: Optional[datetime] = Field(default_factory=datetime.now)
+    created_at: Optional[datetime] = Field(default_factory=_now_utc)
+    updated_at: Optional[datetime] = Field(default_factory=_now_utc)
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ConnectionCreate(BaseModel):
@@ -62,14 +80,6 @@ class JWTTokenData(BaseModel):
         """Generate a random UUID for the token ID if not provided"""
         return v or str(uuid.uuid4())
 
-    @field_validator("user_id", mode="before")
-    @classmethod
-    def validate_user_id(cls, v: uuid.UUID) -> uuid.UUID:
-        """Ensure user_id is a UUID - convert from string if needed"""
-        if isinstance(v, str):
-            return uuid.UUID(v)
-        return v
-
 
 class ErrorResponse(BaseModel):
     """Error response model."""
@@ -85,4 +95,4 @@ class ConnectionUpdate(BaseModel):
     friend_id: uuid.UUID = Field(..., description="ID of the user being connected to")
     status: ConnectionStatus = Field(..., description="New status of the connection")
     created_at: Optional[datetime] = Field(None, description="Creation timestamp")
-    updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = Field(default_factory=_now_utc)
@@ -8,6 +8,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .api.routers import router
 from .core.config import get_settings
@@ -46,6 +47,13 @@ connection_manager = ConnectionManager(
             "host": settings.POSTGRES_HOST,
             "port": settings.POSTGRES_PORT,
             "database": settings.POSTGRES_DB,
+            "pool": {
+                "min_size": settings.POSTGRES_POOL_MIN_SIZE,
+                "max_size": settings.POSTGRES_POOL_MAX_SIZE,
+                "max_inactive_connection_lifetime": (
+                    settings.POSTGRES_POOL_MAX_INACTIVE_LIFETIME
+                ),
+            },
         },
     },
     rabbitmq_client=rabbitmq_client
@@ -82,6 +90,8 @@ app = FastAPI(
     description="Service for managing Connections",
     version="0.1.0",
     lifespan=lifespan,
+    # orjson encodes UUID/datetime natively and much faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -1,4 +1,5 @@
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 from pydantic import Field, SecretStr
@@ -44,19 +45,24 @@ class Settings(BaseSettings):
     MONGO_PORT: str = Field(default="27017")
     MONGO_DB_NAME: str = Field(default="chat_db")
 
-    MONGO_URI: str = f"mongodb://{MONGO_USER}:{MONGO_PASSWORD}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}?authSource=admin"
-
    # App user settings
     APP_USER: str = Field(default="app_user")
     APP_PASSWORD: SecretStr = Field(default=SecretStr("app_password"))
 
-    @property
+    @cached_property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD.get_secret_value()}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
-    @property
+    @cached_property
     def APP_DATABASE_URL(self) -> str:
         return f"postgresql://{self.APP_USER}:{self.APP_PASSWORD.get_secret_value()}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @cached_property
+    def MONGO_URI(self) -> str:
+        return f"mongodb://{self.MONGO_USER}:{self.MONGO_PASSWORD.get_secret_value()}@{self.MONGO_HOST}:{self.MONGO_PORT}/{self.MONGO_DB_NAME}?authSource=admin"
+
+
+@lru_cache()
 def get_settings() -> Settings:
+    """Create and return a cached Settings instance."""
     return Settings()
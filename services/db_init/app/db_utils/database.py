@@ -1,29 +1,60 @@
 import logging
+import random
+import socket
+import time
+from functools import lru_cache
 
-from config import get_settings
 from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.exc import OperationalError
 
+from services.db_init.app.config import get_settings
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4)
+def get_engine(url: str) -> Engine:
+    """Return a shared engine (and connection pool) for the given URL."""
+    # The pool is kept so the init steps reuse one connection, but it is
+    # small and not pre-pinged: the process is short-lived, so pooled
+    # connections don't go stale. connect_timeout stops a probe against
+    # an unresponsive server from hanging for the OS TCP timeout.
+    # Init is idempotent and re-run after a crash, so its commits don't
+    # need to wait for the WAL flush; IF NOT EXISTS notices are muted
+    return create_engine(
+        url,
+        pool_size=2,
+        connect_args={
+            "connect_timeout": 3,
+            "application_name": "db_init",
+            "options": (
+                "-c synchronous_commit=off -c client_min_messages=warning"
+            ),
+        },
+    )
+
+
 def create_database_if_not_exists() -> bool:
     """Create the database if it does not exist."""
     settings = get_settings()
     postgres_url_parts = settings.DATABASE_URL.split("/")
     postgres_url = "/".join(postgres_url_parts[:-1] + ["postgres"])
     try:
-        engine = create_engine(postgres_url)
-        with engine.connect() as conn:
+        engine = get_engine(postgres_url)
+        # CREATE DATABASE can't run inside a transaction; autocommit avoids
+        # the manual COMMIT round trip
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
             result = conn.execute(
-                text("SELECT 1 FROM pg_database WHERE datname = 'sycolibre'")
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": "sycolibre"},
             )
             exists = result.scalar() is not None
             if not exists:
                 logger.info("Database 'sycolibre' does not exist. Creating...")
-                conn.execute(text("COMMIT"))
-                conn.execute(text("CREATE DATABASE sycolibre"))
+                conn.exec_driver_sql("CREATE DATABASE sycolibre")
                 logger.info("Database 'sycolibre' created successfully")
             else:
                 logger.info("Database 'sycolibre' already exists")
@@ -34,38 +65,44 @@ def create_database_if_not_exists() -> bool:
 
 
 def wait_for_db(max_retries: int = 30, retry_interval: int = 2) -> bool:
-    """Wait for the database to be available."""
+    """Wait for the database to be available.
+
+    Polls with jittered exponential backoff starting at 0.1s and capped at
+    ``retry_interval``, for at most ``max_retries * retry_interval``
+    seconds of wall-clock time. Each attempt first checks the port with a
+    plain TCP connect and only opens a database connection once it answers.
+    """
     logger.info("Waiting for database to be available...")
     settings = get_settings()
-    postgres_url = settings.DATABASE_URL
-    retries = 0
-    while retries < max_retries:
+    url = make_url(settings.DATABASE_URL)
+    address = (url.host, url.port or 5432)
+    engine = get_engine(settings.DATABASE_URL)
+    deadline = time.monotonic() + max_retries * retry_interval
+    delay = 0.1
+    last_error = None
+    while True:
         try:
-            engine = create_engine(postgres_url)
-            conn = engine.connect()
-            conn.close()
+            socket.create_connection(address, timeout=1).close()
+            with engine.connect():
+                pass
             logger.info("Successfully connected to the database")
             return True
-        except OperationalError as e:
-            logger.warning(f"Database not available yet: {e}")
-            retries += 1
-            import time
-
-            time.sleep(retry_interval)
-    logger.error(f"Could not connect to database after {max_retries} attempts")
+        except (OSError, OperationalError) as e:
+            # Log the first failure and each change of failure, not every
+            # probe; repeats of the same failure stay at debug
+            if type(e) is not last_error:
+                logger.warning(f"Database not available yet: {e}")
+                last_error = type(e)
+            else:
+                logger.debug(f"Database still not available: {e}")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay + random.uniform(0, 0.1), remaining))
+        delay = min(delay * 2, retry_interval)
+    logger.error(
+        "Could not connect to database after "
+        f"{max_retries * retry_interval} seconds"
+    )
     return False
 
-
-def ensure_uuid_extension(engine: Engine) -> bool:
-    """Ensure the uuid-ossp extension exists in the current database."""
-    try:
-        with engine.begin() as conn:
-            conn.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
-            conn.execute(text("SELECT uuid_generate_v4()"))
-        logger.info(
-            "uuid-ossp extension is enabled and uuid_generate_v4() is available."
-        )
-        return True
-    except Exception as e:
-        logger.error(f"Failed to create or verify uuid-ossp extension: {e}")
-        return False
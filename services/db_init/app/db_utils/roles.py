@@ -6,108 +6,59 @@ from sqlalchemy.exc import OperationalError
 
 logger = logging.getLogger(__name__)
 
+_SCHEMAS = ("users", "presence", "connections")
+
 
 def create_roles_if_not_exist(engine: Engine) -> None:
     """Create roles/users and grant permissions if they do not exist."""
-    postgres_users = ["Michael", "Nicholas", "James"]
+    # Role names as stored in pg_roles (the unquoted originals were
+    # folded to lower case)
+    postgres_users = ["michael", "nicholas", "james"]
     try:
-        with engine.connect() as conn:
+        with engine.begin() as conn:
+            # Identifiers can't be bound parameters; quote them instead of
+            # splicing raw names into DDL
+            quote = conn.dialect.identifier_preparer.quote
+            existing = set(
+                conn.execute(
+                    text(
+                        "SELECT rolname FROM pg_roles "
+                        "WHERE rolname = ANY(:names)"
+                    ),
+                    {"names": postgres_users},
+                ).scalars()
+            )
+            statements = []
             for user in postgres_users:
-                result = conn.execute(
-                    text(f"SELECT 1 FROM pg_roles WHERE rolname = '{user}'")
-                )
-                exists = result.scalar() is not None
-                if not exists:
+                if user not in existing:
                     logger.info(f"Creating database user '{user}'...")
-                    conn.execute(
-                        text(f"CREATE USER {user} WITH PASSWORD 'password'")
+                    statements.append(
+                        f"CREATE USER {quote(user)} WITH PASSWORD 'password'"
                     )
                 else:
                     logger.info(f"Database user '{user}' already exists")
-                logger.info(f"Granting permissions to {user}...")
-                conn.execute(text(f"GRANT USAGE ON SCHEMA users TO {user}"))
-                conn.execute(text(f"GRANT USAGE ON SCHEMA presence TO {user}"))
-                conn.execute(
-                    text(f"GRANT USAGE ON SCHEMA connections TO {user}")
-                )
-                conn.execute(
-                    text(
-                        f"GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA users TO {user}"
-                    )
-                )
-                conn.execute(
-                    text(
-                        f"GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA presence TO {user}"
-                    )
-                )
-                conn.execute(
-                    text(
-                        f"GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA connections TO {user}"
-                    )
-                )
-                conn.execute(
-                    text(
-                        f"GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA users TO {user}"
-                    )
-                )
-                conn.execute(
-                    text(
-                        f"GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA presence TO {user}"
-                    )
-                )
-                conn.execute(
-                    text(
-                        f"GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA connections TO {user}"
-                    )
-                )
-                conn.execute(
-                    text(
-                        f"ALTER ROLE {user} SET search_path TO users, presence, connections, public"
-                    )
-                )
-                conn.execute(text(f"GRANT CREATE ON SCHEMA users TO {user}"))
-                conn.execute(
-                    text(f"GRANT CREATE ON SCHEMA presence TO {user}")
-                )
-                conn.execute(
-                    text(f"GRANT CREATE ON SCHEMA connections TO {user}")
-                )
-            # Grant future permissions for new tables/sequences
-            conn.execute(
-                text(
-                    "ALTER DEFAULT PRIVILEGES IN SCHEMA users GRANT ALL ON TABLES TO "
-                    + ", ".join(postgres_users)
-                )
-            )
-            conn.execute(
-                text(
-                    "ALTER DEFAULT PRIVILEGES IN SCHEMA presence GRANT ALL ON TABLES TO "
-                    + ", ".join(postgres_users)
-                )
-            )
-            conn.execute(
-                text(
-                    "ALTER DEFAULT PRIVILEGES IN SCHEMA connections GRANT ALL ON TABLES TO "
-                    + ", ".join(postgres_users)
-                )
-            )
-            conn.execute(
-                text(
-                    "ALTER DEFAULT PRIVILEGES IN SCHEMA users GRANT ALL ON SEQUENCES TO "
-                    + ", ".join(postgres_users)
-                )
-            )
-            conn.execute(
-                text(
-                    "ALTER DEFAULT PRIVILEGES IN SCHEMA presence GRANT ALL ON SEQUENCES TO "
-                    + ", ".join(postgres_users)
-                )
-            )
-            conn.execute(
-                text(
-                    "ALTER DEFAULT PRIVILEGES IN SCHEMA connections GRANT ALL ON SEQUENCES TO "
-                    + ", ".join(postgres_users)
-                )
-            )
+            # One round trip for the new users and every grant: GRANT and
+            # ALTER DEFAULT PRIVILEGES both accept lists of schemas and
+            # grantees
+            grantees = ", ".join(quote(user) for user in postgres_users)
+            schemas = ", ".join(quote(schema) for schema in _SCHEMAS)
+            statements += [
+                f"GRANT USAGE, CREATE ON SCHEMA {schemas} TO {grantees}",
+                f"GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA {schemas} "
+                f"TO {grantees}",
+                f"GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA {schemas} "
+                f"TO {grantees}",
+                # Grant future permissions for new tables/sequences
+                f"ALTER DEFAULT PRIVILEGES IN SCHEMA {schemas} "
+                f"GRANT ALL ON TABLES TO {grantees}",
+                f"ALTER DEFAULT PRIVILEGES IN SCHEMA {schemas} "
+                f"GRANT ALL ON SEQUENCES TO {grantees}",
+            ]
+            statements += [
+                f"ALTER ROLE {quote(user)} SET search_path TO {schemas}, public"
+                for user in postgres_users
+            ]
+            logger.info(f"Granting permissions to {grantees}...")
+            conn.exec_driver_sql(";\n".join(statements))
     except OperationalError as e:
         logger.error(f"Error creating roles: {e}", exc_info=True)
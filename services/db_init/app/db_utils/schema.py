@@ -1,34 +1,173 @@
 import logging
 
-from sqlalchemy import inspect, text
+from sqlalchemy import text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import DeclarativeMeta
+from sqlalchemy.schema import CreateIndex
 
 logger = logging.getLogger(__name__)
 
 
+# Created once a full initialization has succeeded
+_INIT_MARKER = "public._sycolibre_initialized"
+
+
+def is_database_initialized(engine: Engine) -> bool:
+    """Check for the marker left by a previous successful init."""
+    try:
+        with engine.connect() as conn:
+            return (
+                conn.execute(
+                    text("SELECT to_regclass(:name) IS NOT NULL"),
+                    {"name": _INIT_MARKER},
+                ).scalar()
+                is True
+            )
+    except OperationalError:
+        # Database missing or not up yet: take the full init path
+        return False
+
+
+def mark_database_initialized(engine: Engine) -> None:
+    """Record that initialization completed successfully."""
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {_INIT_MARKER} ()"))
+
+
 def create_schemas_if_not_exist(engine: Engine) -> None:
-    """Create schemas if they do not exist."""
+    """Create schemas and the uuid-ossp extension if they do not exist."""
+    with engine.begin() as conn:
+        logger.info("Creating schemas and uuid-ossp extension if not exist...")
+        # Sent as one multi-statement script: a single round trip. The
+        # extension is created here too; a failure raises, so no separate
+        # uuid_generate_v4() probe is needed
+        conn.exec_driver_sql(
+            "CREATE SCHEMA IF NOT EXISTS users; "
+            "CREATE SCHEMA IF NOT EXISTS presence; "
+            "CREATE SCHEMA IF NOT EXISTS connections; "
+            'CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'
+        )
+
+
+# Indexes made redundant by constraints or the keyset indexes, replaced
+# by a renamed index with a new definition, or no longer used (the
+# pending partial indexes made every status change a non-HOT update)
+_DROP_REDUNDANT_INDEXES_SQL = """
+DROP INDEX IF EXISTS connections.idx_connection_user,
+    connections.idx_connection_friend,
+    connections.idx_connection_user_friend,
+    connections.idx_conn_user_created,
+    connections.idx_conn_friend_created,
+    connections.idx_conn_user_pending,
+    connections.idx_conn_friend_pending
+"""
+
+# Move connections.status from varchar + CHECK to a native enum
+_CONNECTION_STATUS_ENUM_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'connections'
+        AND table_name = 'connections'
+        AND column_name = 'status'
+        AND data_type = 'character varying'
+    ) THEN
+        IF to_regtype('connections.connection_status') IS NULL THEN
+            CREATE TYPE connections.connection_status AS ENUM
+                ('pending', 'accepted', 'rejected', 'blocked');
+        END IF;
+        ALTER TABLE connections.connections
+            DROP CONSTRAINT IF EXISTS ck_connection_status_enum,
+            ALTER COLUMN status TYPE connections.connection_status
+                USING status::connections.connection_status;
+    END IF;
+END $$
+"""
+
+
+def apply_schema_upgrades(engine: Engine, base: DeclarativeMeta) -> None:
+    """Apply idempotent upgrades for databases created by older versions.
+
+    Every index declared on the models is created if missing, so indexes
+    added after a database was first initialized reach it too. The
+    replacements are built before the indexes they supersede are dropped.
+    Expects the tables to exist.
+    """
     with engine.begin() as conn:
-        logger.info("Creating schemas if not exist...")
-        conn.execute(text("CREATE SCHEMA IF NOT EXISTS users"))
-        conn.execute(text("CREATE SCHEMA IF NOT EXISTS presence"))
-        conn.execute(text("CREATE SCHEMA IF NOT EXISTS connections"))
+        logger.info("Applying schema upgrades if needed...")
+        create_indexes = [
+            str(
+                CreateIndex(index, if_not_exists=True).compile(
+                    dialect=conn.dialect
+                )
+            )
+            for table in base.metadata.sorted_tables
+            for index in sorted(table.indexes, key=lambda i: i.name)
+        ]
+        # Sent as one multi-statement script: a single round trip
+        conn.exec_driver_sql(
+            ";\n".join(
+                (
+                    _CONNECTION_STATUS_ENUM_SQL,
+                    *create_indexes,
+                    _DROP_REDUNDANT_INDEXES_SQL,
+                )
+            )
+        )
 
 
 def create_tables_if_not_exist(engine: Engine, base: DeclarativeMeta) -> None:
     """Create tables if they do not exist."""
-    logger.info("Creating tables if not exist...")
-    base.metadata.create_all(engine)
+    # One to_regclass probe for every table instead of create_all's
+    # per-table existence checks; skip DDL entirely when nothing is missing
+    names = [table.fullname for table in base.metadata.sorted_tables]
+    with engine.connect() as conn:
+        missing = (
+            conn.execute(
+                text(
+                    "SELECT name FROM unnest(CAST(:names AS text[])) AS name "
+                    "WHERE to_regclass(name) IS NULL"
+                ),
+                {"names": names},
+            )
+            .scalars()
+            .all()
+        )
+    if not missing:
+        logger.info("All tables already exist, skipping table creation")
+        return
+    logger.info(f"Creating missing tables: {', '.join(missing)}")
+    # Limit create_all to the missing tables so it doesn't re-inspect the
+    # ones the probe already found
+    base.metadata.create_all(
+        engine, tables=[base.metadata.tables[name] for name in missing]
+    )
 
 
-def table_exists_and_has_data(engine: Engine, schema: str, table: str) -> bool:
-    """Check if a table exists and has at least one row."""
-    inspector = inspect(engine)
-    if not inspector.has_table(table, schema=schema):
-        return False
+def all_tables_have_data(engine: Engine, tables: list[str]) -> bool:
+    """Check that every ``schema.table`` in ``tables`` exists and has rows.
+
+    A statement can't reference a missing table, so existence is checked
+    first with to_regclass; the row checks then run as one query.
+    """
     with engine.connect() as conn:
-        result = conn.execute(
-            text(f'SELECT EXISTS (SELECT 1 FROM "{schema}"."{table}" LIMIT 1)')
+        all_exist = conn.execute(
+            text(
+                "SELECT bool_and(to_regclass(name) IS NOT NULL) "
+                "FROM unnest(CAST(:names AS text[])) AS name"
+            ),
+            {"names": tables},
+        ).scalar()
+        if not all_exist:
+            return False
+        quote = conn.dialect.identifier_preparer.quote
+        checks = " AND ".join(
+            "EXISTS (SELECT 1 FROM {} LIMIT 1)".format(
+                ".".join(quote(part) for part in table.split("."))
+            )
+            for table in tables
         )
-        return result.scalar() is True
+        return conn.execute(text(f"SELECT {checks}")).scalar() is True
+
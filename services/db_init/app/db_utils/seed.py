@@ -1,9 +1,11 @@
 import logging
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 
 from argon2 import PasswordHasher
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import sessionmaker
 
 from services.db_init.app.models import (
     Connection,
@@ -20,118 +22,117 @@ ph = PasswordHasher(
     parallelism=4,
 )
 
+# Use hardcoded UUIDs for test users
+TEST_USER1_ID = "11111111-1111-1111-1111-111111111111"
+TEST_USER2_ID = "22222222-2222-2222-2222-222222222222"
+TEST_RESET_TOKEN = "test-reset-token-123"
+
+
+@lru_cache(maxsize=1)
+def _seed_password_hash() -> str:
+    """Hash the shared seed password once and reuse it for every user."""
+    return ph.hash("password")
+
 
 def seed_initial_data_if_not_exists(engine: Engine) -> bool:
     """Seed initial data if it does not already exist."""
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
+    # One INSERT ... ON CONFLICT DO NOTHING per table, all in a single
+    # transaction: rows that already exist are skipped by the database
+    # instead of being probed for one by one
+    users_rows = [
+        {
+            "id": TEST_USER1_ID,
+            "username": "test_user",
+            "email": "test@example.com",
+            "hashed_password": _seed_password_hash(),
+            "profile_picture_url": "https://example.com/test.jpg",
+        },
+        {
+            "id": TEST_USER2_ID,
+            "username": "test_user2",
+            "email": "test2@example.com",
+            "hashed_password": _seed_password_hash(),
+            "profile_picture_url": "https://example.com/test2.jpg",
+        },
+    ]
     try:
-        # Use hardcoded UUIDs for test users
-        TEST_USER1_ID = "11111111-1111-1111-1111-111111111111"
-        TEST_USER2_ID = "22222222-2222-2222-2222-222222222222"
-        test_user = db.query(User).filter(User.username == "test_user").first()
-        test_user2 = (
-            db.query(User).filter(User.username == "test_user2").first()
-        )
-        if not test_user:
-            logger.info("Creating test user 1...")
-            test_user = User(
-                id=TEST_USER1_ID,
-                username="test_user",
-                email="test@example.com",
-                hashed_password=ph.hash("password"),
-                profile_picture_url="https://example.com/test.jpg",
-            )
-            db.add(test_user)
-            db.commit()
-            db.refresh(test_user)
-            logger.info("Creating test user 1 status...")
-            test_status = UserStatus(user_id=test_user.id, status="away")
-            db.add(test_status)
-            db.commit()
-            logger.info(f"Test user 1 added (id: {test_user.id})")
-        else:
-            logger.info(f"Test user 1 already exists (id: {test_user.id})")
-        if not test_user2:
-            logger.info("Creating test user 2...")
-            test_user2 = User(
-                id=TEST_USER2_ID,
-                username="test_user2",
-                email="test2@example.com",
-                hashed_password=ph.hash("password"),
-                profile_picture_url="https://example.com/test2.jpg",
+        with engine.begin() as conn:
+            ids = dict(
+                conn.execute(
+                    pg_insert(User)
+                    .values(users_rows)
+                    .on_conflict_do_nothing()
+                    .returning(User.username, User.id)
+                ).all()
             )
-            db.add(test_user2)
-            db.commit()
-            db.refresh(test_user2)
-            logger.info("Creating test user 2 status...")
-            test_status2 = UserStatus(user_id=test_user2.id, status="online")
-            db.add(test_status2)
-            db.commit()
-            logger.info(f"Test user 2 added (id: {test_user2.id})")
-        else:
-            logger.info(f"Test user 2 already exists (id: {test_user2.id})")
-        if test_user and test_user2:
-            existing_connection1 = (
-                db.query(Connection)
-                .filter(
-                    Connection.user_id == test_user.id,
-                    Connection.friend_id == test_user2.id,
+            logger.info(f"Test users added: {len(ids)}")
+            # Users that already existed return no row, and may not have
+            # the hardcoded ids: resolve them in one round trip
+            existing = [
+                row["username"]
+                for row in users_rows
+                if row["username"] not in ids
+            ]
+            if existing:
+                ids.update(
+                    conn.execute(
+                        select(User.username, User.id).where(
+                            User.username.in_(existing)
+                        )
+                    ).all()
                 )
-                .first()
+            user1_id, user2_id = ids["test_user"], ids["test_user2"]
+            status_rows = [
+                {"user_id": user1_id, "status": "away"},
+                {"user_id": user2_id, "status": "online"},
+            ]
+            connection_rows = [
+                {
+                    "user_id": user1_id,
+                    "friend_id": user2_id,
+                    "status": "accepted",
+                },
+                {
+                    "user_id": user2_id,
+                    "friend_id": user1_id,
+                    "status": "accepted",
+                },
+            ]
+            reset_rows = [
+                {
+                    "user_id": user1_id,
+                    "token": TEST_RESET_TOKEN,
+                    "expires_at": datetime.now(UTC) + timedelta(hours=1),
+                },
+            ]
+            statuses = conn.execute(
+                pg_insert(UserStatus)
+                .values(status_rows)
+                .on_conflict_do_nothing(index_elements=["user_id"])
             )
-            existing_connection2 = (
-                db.query(Connection)
-                .filter(
-                    Connection.user_id == test_user2.id,
-                    Connection.friend_id == test_user.id,
+            logger.info(f"Test user statuses added: {statuses.rowcount}")
+            connections = conn.execute(
+                pg_insert(Connection)
+                .values(connection_rows)
+                .on_conflict_do_nothing(
+                    index_elements=["user_id", "friend_id"]
                 )
-                .first()
             )
-            if not existing_connection1:
-                logger.info("Creating test connection (user1 -> user2)...")
-                test_connection1 = Connection(
-                    user_id=test_user.id,
-                    friend_id=test_user2.id,
-                    status="accepted",
+            logger.info(f"Test connections added: {connections.rowcount}")
+            resets = conn.execute(
+                pg_insert(PasswordResetToken)
+                .values(reset_rows)
+                .on_conflict_do_nothing(index_elements=["token"])
+            )
+            if resets.rowcount:
+                logger.info(
+                    f"Test password reset token created: {TEST_RESET_TOKEN}"
                 )
-                db.add(test_connection1)
-                db.commit()
-            if not existing_connection2:
-                logger.info("Creating test connection (user2 -> user1)...")
-                test_connection2 = Connection(
-                    user_id=test_user2.id,
-                    friend_id=test_user.id,
-                    status="accepted",
+            else:
+                logger.info(
+                    "Test password reset token already exists for test user"
                 )
-                db.add(test_connection2)
-                db.commit()
-        test_token = "test-reset-token-123"
-        expiry = datetime.now(UTC) + timedelta(hours=1)
-        existing_reset = (
-            db.query(PasswordResetToken)
-            .filter_by(user_id=test_user.id)
-            .first()
-        )
-        if not existing_reset:
-            logger.info("Creating test password reset token...")
-            reset_entry = PasswordResetToken(
-                user_id=test_user.id,
-                token=test_token,
-                expires_at=expiry,
-            )
-            db.add(reset_entry)
-            db.commit()
-            db.refresh(reset_entry)
-            logger.info(f"Test password reset token created: {test_token}")
-        else:
-            logger.info(
-                "Test password reset token already exists for test user"
-            )
         return True
     except Exception as e:
         logger.error(f"Error seeding data: {e}", exc_info=True)
-        db.rollback()
         return False
-    finally:
-        db.close()
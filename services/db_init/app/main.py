@@ -1,57 +1,68 @@
 import asyncio
 
-from sqlalchemy import create_engine
-
 from services.db_init.app.config import get_settings
 from services.db_init.app.db_utils.database import (
     create_database_if_not_exists,
-    ensure_uuid_extension,
+    get_engine,
     wait_for_db,
 )
 from services.db_init.app.db_utils.logging_config import setup_logging
 from services.db_init.app.db_utils.roles import create_roles_if_not_exist
 from services.db_init.app.db_utils.schema import (
+    all_tables_have_data,
+    apply_schema_upgrades,
     create_schemas_if_not_exist,
     create_tables_if_not_exist,
-    table_exists_and_has_data,
+    is_database_initialized,
+    mark_database_initialized,
 )
 from services.db_init.app.db_utils.seed import seed_initial_data_if_not_exists
 from services.db_init.app.init_mongodb import init_mongodb
 from services.db_init.app.models import Base
 
 
-def init_database() -> bool:
-    """Initialize the database with schemas and tables, idempotently."""
-    setup_logging()
-    # Run the async MongoDB initialization
-    asyncio.run(init_mongodb())
+def _init_postgres() -> bool:
+    """Initialize PostgreSQL with schemas, tables and seed data."""
     settings = get_settings()
-    if not create_database_if_not_exists():
-        return False
-    if not wait_for_db():
-        return False
-    engine = create_engine(settings.DATABASE_URL)
-    # Only create schemas/tables if not already present with data
-    if all(
-        [
-            table_exists_and_has_data(engine, "users", "users"),
-            table_exists_and_has_data(engine, "presence", "presence"),
-            table_exists_and_has_data(engine, "connections", "connections"),
-        ]
-    ):
-        return True
+    engine = get_engine(settings.DATABASE_URL)
+    # A previous run finished: the database exists and is seeded, but
+    # schemas, tables, indexes and grants added to the models since then
+    # still have to be applied
+    initialized = is_database_initialized(engine)
+    if not initialized:
+        if not create_database_if_not_exists():
+            return False
+        if not wait_for_db():
+            return False
+    # Upgrades index the tables, so they must exist first
     create_schemas_if_not_exist(engine)
-    if not ensure_uuid_extension(engine):
-        return False
     create_tables_if_not_exist(engine, Base)
+    apply_schema_upgrades(engine, Base)
     create_roles_if_not_exist(engine)
-    if not seed_initial_data_if_not_exists(engine):
+    if initialized:
+        return True
+    # Only seed if the tables are not already present with data
+    if not all_tables_have_data(
+        engine, ["users.users", "presence.presence", "connections.connections"]
+    ) and not seed_initial_data_if_not_exists(engine):
         return False
+    mark_database_initialized(engine)
     return True
 
 
+async def init_database() -> bool:
+    """Initialize the database with schemas and tables, idempotently."""
+    setup_logging()
+    # MongoDB and PostgreSQL are independent: run the blocking PostgreSQL
+    # steps in a worker thread while the MongoDB init runs on the loop
+    _, postgres_ok = await asyncio.gather(
+        init_mongodb(), asyncio.to_thread(_init_postgres)
+    )
+    return postgres_ok
+
+
 if __name__ == "__main__":
-    if init_database():
+    if asyncio.run(init_database()):
         print("Database initialization completed successfully")
     else:
         print("Database initialization failed")
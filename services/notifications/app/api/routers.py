@@ -1,8 +1,11 @@
 # fastAPI API Routers
+import hashlib
 import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from cachetools import TTLCache
 from fastapi import (
     APIRouter,
     Depends,
@@ -39,9 +42,19 @@ router = APIRouter(tags=["notifications"])
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Recently verified tokens, keyed by the token's sha256 digest (never the
+# raw token) and mapped to (user_id, exp). Entries live at most a few
+# seconds and are never served past the token's own expiry.
+_TOKEN_CACHE_TTL = 5
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=_TOKEN_CACHE_TTL)
+
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
     """Extract and validate user ID from JWT token"""
+    key = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(key)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
     try:
         secret_key = settings.JWT_SECRET_KEY.get_secret_value()
         payload = jwt.decode(
@@ -56,6 +69,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        _token_cache[key] = (
+            user_id,
+            payload.get("exp", time.time() + _TOKEN_CACHE_TTL),
+        )
         return user_id
     except jwt.JWTError:
         raise HTTPException(
@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     RABBITMQ_USER: str = "guest"
     RABBITMQ_PASSWORD: str = "guest"
     RABBITMQ_VHOST: str = "/"
+    RABBITMQ_MAX_CHANNEL_POOL_SIZE: int = 16
 
     # Allow extra fields from environment variables
     model_config = SettingsConfigDict(
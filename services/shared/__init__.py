@@ -5,6 +5,7 @@ This package contains shared code, utilities, and common functionality
 that can be used across different microservices.
 """
 
-from .utils.retry import CircuitBreaker, with_retry
+from .utils.rate_limit import TokenBucket
+from .utils.retry import CircuitBreaker, with_retry, with_retry_cfg
 
-__all__ = ["CircuitBreaker", "with_retry"]
+__all__ = ["CircuitBreaker", "TokenBucket", "with_retry", "with_retry_cfg"]
@@ -2,6 +2,7 @@
 Shared utilities module containing common functionality for microservices.
 """
 
-from .retry import CircuitBreaker, with_retry
+from .rate_limit import TokenBucket
+from .retry import CircuitBreaker, with_retry, with_retry_cfg
 
-__all__ = ["CircuitBreaker", "with_retry"]
+__all__ = ["CircuitBreaker", "TokenBucket", "with_retry", "with_retry_cfg"]
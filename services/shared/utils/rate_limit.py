@@ -0,0 +1,34 @@
+"""
+In-process rate limiting utilities.
+"""
+
+import time
+
+
+class TokenBucket:
+    """Token bucket rate limiter.
+
+    Holds up to ``capacity`` tokens and regains ``refill_rate`` tokens per
+    second. Not thread-safe; meant for use from a single event loop.
+    """
+
+    __slots__ = ("capacity", "refill_rate", "tokens", "last_refill")
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def try_consume(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available; return whether the call is allowed."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.last_refill) * self.refill_rate,
+        )
+        self.last_refill = now
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
@@ -3,7 +3,9 @@ Retry utility module with exponential backoff and circuit breaker patterns.
 """
 
 import asyncio
+import functools
 import logging
+import random
 from typing import Any, Awaitable, Callable, Optional, TypeVar, Union, cast
 
 logger = logging.getLogger(__name__)
@@ -66,6 +68,7 @@ async def with_retry(
     max_delay: float = 60.0,
     exponential_base: float = 2.0,
     jitter: float = 0.1,
+    full_jitter: bool = False,
     circuit_breaker: Optional[CircuitBreaker] = None,
     operation_args: tuple = (),  # Arguments for the operation
     operation_kwargs: dict = None  # Keyword arguments for the operation
@@ -80,6 +83,8 @@ async def with_retry(
         max_delay: Maximum delay between retries in seconds
         exponential_base: Base for exponential backoff
         jitter: Random jitter factor to add to delay
+        full_jitter: Sleep a uniform random time between zero and the
+            backoff delay instead (ignores ``jitter``)
         circuit_breaker: Optional circuit breaker instance
         *args: Positional arguments for the operation
         **kwargs: Keyword arguments for the operation
@@ -128,10 +133,13 @@ async def with_retry(
                 )
                 raise
 
-            # Calculate next delay with jitter
-            jitter_amount = delay * jitter * \
-                (2 * asyncio.get_event_loop().time() % 1 - 1)
-            actual_delay = min(delay + jitter_amount, max_delay)
+            # Calculate next delay with jitter so that instances
+            # retrying the same dependency don't reconnect in lockstep
+            if full_jitter:
+                actual_delay = random.uniform(0, min(delay, max_delay))
+            else:
+                jitter_amount = delay * random.uniform(-jitter, jitter)
+                actual_delay = min(delay + jitter_amount, max_delay)
 
             logger.warning(
                 f"Operation failed (attempt {attempt + 1}/{max_attempts}), "
@@ -150,3 +158,54 @@ async def with_retry(
         )
 
     raise RuntimeError("Unreachable code - this should never happen")
+
+
+def with_retry_cfg(
+    max_attempts: int = 5,
+    initial_delay: float = 5.0,
+    max_delay: float = 60.0,
+    exponential_base: float = 2.0,
+    jitter: float = 0.1,
+    full_jitter: bool = False,
+    cb_attr: Optional[str] = None,
+) -> Callable[[AsyncCallable[T]], AsyncCallable[T]]:
+    """
+    Decorator form of with_retry for async methods.
+
+    The retry configuration is bound once at class-definition time, so
+    calls don't rebuild a kwargs dict or wrap the method in a lambda.
+
+    Args:
+        max_attempts: Maximum number of retry attempts
+        initial_delay: Initial delay between retries in seconds
+        max_delay: Maximum delay between retries in seconds
+        exponential_base: Base for exponential backoff
+        jitter: Random jitter factor to add to delay
+        full_jitter: Sleep a uniform random time up to the backoff delay
+        cb_attr: Name of the CircuitBreaker attribute on ``self``,
+            looked up at call time
+
+    Returns:
+        A decorator wrapping the method with retry logic
+    """
+
+    def decorator(func: AsyncCallable[T]) -> AsyncCallable[T]:
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            circuit_breaker = getattr(self, cb_attr) if cb_attr else None
+            return await with_retry(
+                func,
+                max_attempts=max_attempts,
+                initial_delay=initial_delay,
+                max_delay=max_delay,
+                exponential_base=exponential_base,
+                jitter=jitter,
+                full_jitter=full_jitter,
+                circuit_breaker=circuit_breaker,
+                operation_args=(self, *args),
+                operation_kwargs=kwargs,
+            )
+
+        return wrapper
+
+    return decorator